@@ -1,5 +1,4 @@
 from compas.datastructures import Network
-from compas.geometry import length_vector
 
 from compas_cem.data import Data
 from compas_cem.diagrams import NodeMixins
@@ -19,6 +18,8 @@ class Diagram(Data, NodeMixins, EdgeMixins, Network):
     Base class that shares functionality across diagrams.
     """
     def __init__(self, *args, **kwargs):
+        self._type_index = {}
+
         super(Diagram, self).__init__(*args, **kwargs)
 
         self.update_default_node_attributes({"x": 0.0,
@@ -65,6 +66,20 @@ class Diagram(Data, NodeMixins, EdgeMixins, Network):
         """
         return self.attributes["gkey_node"]
 
+    @property
+    def data(self):
+        """
+        The data dictionary that represents the diagram.
+        """
+        return super(Diagram, self).data
+
+    @data.setter
+    def data(self, data):
+        """
+        """
+        super(Diagram, type(self)).data.fset(self, data)
+        self._clear_type_index()
+
 # ==============================================================================
 #  Node collections
 # ==============================================================================
@@ -78,7 +93,7 @@ class Diagram(Data, NodeMixins, EdgeMixins, Network):
         support_node : ``int``
             The key of the next node with a support.
         """
-        return self.nodes_where({"type": "support"})
+        return self._nodes_of_type("support")
 
     def loaded_nodes(self, min_force=1e-6):
         """
@@ -95,8 +110,11 @@ class Diagram(Data, NodeMixins, EdgeMixins, Network):
         loaded_node : ``int``
             The key of the next loaded node.
         """
+        min_force_sqrd = min_force * min_force
+
         for node in self.nodes():
-            if self.is_node_loaded(node, min_force):
+            qx, qy, qz = self.node_load(node)
+            if qx * qx + qy * qy + qz * qz > min_force_sqrd:
                 yield node
 
 # ==============================================================================
@@ -112,7 +130,7 @@ class Diagram(Data, NodeMixins, EdgeMixins, Network):
         number : ``int``
             The number of nodes with a support.
         """
-        return len(list(self.support_nodes()))
+        return sum(1 for _ in self.support_nodes())
 
     def number_of_loaded_nodes(self):
         """
@@ -123,7 +141,7 @@ class Diagram(Data, NodeMixins, EdgeMixins, Network):
         number : ``int``
             The number of nodes with an applied load.
         """
-        return len(list(self.loaded_nodes()))
+        return sum(1 for _ in self.loaded_nodes())
 
 # ==============================================================================
 # Node Filters
@@ -161,7 +179,8 @@ class Diagram(Data, NodeMixins, EdgeMixins, Network):
         flag : ``bool``
             ``True``if the node is a support. ``False`` otherwise.
         """
-        return length_vector(self.node_load(node)) > min_force
+        qx, qy, qz = self.node_load(node)
+        return qx * qx + qy * qy + qz * qz > min_force * min_force
 
 # ==============================================================================
 # Node Attributes
@@ -199,6 +218,136 @@ class Diagram(Data, NodeMixins, EdgeMixins, Network):
         """
         return self.node_attributes(key=node, names=["rx", "ry", "rz"])
 
+# ==============================================================================
+# Modifiers
+# ==============================================================================
+
+    def add_node(self, *args, **kwargs):
+        """
+        """
+        self._clear_type_index()
+        return super(Diagram, self).add_node(*args, **kwargs)
+
+    def add_edge(self, *args, **kwargs):
+        """
+        """
+        self._clear_type_index()
+        return super(Diagram, self).add_edge(*args, **kwargs)
+
+    def delete_node(self, key):
+        """
+        """
+        self._clear_type_index()
+        return super(Diagram, self).delete_node(key)
+
+    def delete_edge(self, u, v):
+        """
+        """
+        self._clear_type_index()
+        return super(Diagram, self).delete_edge(u, v)
+
+    def node_attribute(self, key, name, value=None):
+        """
+        """
+        if value is not None and name == "type":
+            self._clear_type_index()
+        return super(Diagram, self).node_attribute(key, name, value)
+
+    def node_attributes(self, key, names=None, values=None):
+        """
+        """
+        if values is not None and "type" in names:
+            self._clear_type_index()
+        return super(Diagram, self).node_attributes(key, names, values)
+
+    def unset_node_attribute(self, key, name):
+        """
+        """
+        self._clear_type_index()
+        return super(Diagram, self).unset_node_attribute(key, name)
+
+    def edge_attribute(self, key, name, value=None):
+        """
+        """
+        if value is not None and name == "type":
+            self._clear_type_index()
+        return super(Diagram, self).edge_attribute(key, name, value)
+
+    def unset_edge_attribute(self, key, name):
+        """
+        """
+        self._clear_type_index()
+        return super(Diagram, self).unset_edge_attribute(key, name)
+
+    def clear(self):
+        """
+        """
+        self._clear_type_index()
+        return super(Diagram, self).clear()
+
+# ==============================================================================
+# Type index
+# ==============================================================================
+
+    def _nodes_of_type(self, node_type):
+        """
+        Iterates over the keys of the nodes of a given type.
+
+        Parameters
+        ----------
+        node_type : ``str``
+            The type of node to search for.
+
+        Yields
+        ------
+        node : ``int``
+            The key of the next node.
+
+        Notes
+        -----
+        The keys are computed once and then cached until the diagram changes.
+        """
+        return self._keys_of_type("node", node_type, self.nodes_where)
+
+    def _edges_of_type(self, edge_type):
+        """
+        Iterates over the keys of the edges of a given type.
+
+        Parameters
+        ----------
+        edge_type : ``str``
+            The type of edge to search for.
+
+        Yields
+        ------
+        edge : ``tuple``
+            The key of the next edge.
+
+        Notes
+        -----
+        The keys are computed once and then cached until the diagram changes.
+        """
+        return self._keys_of_type("edge", edge_type, self.edges_where)
+
+    def _keys_of_type(self, element, element_type, where):
+        """
+        Fetches the keys of the elements of a given type from the type index.
+        """
+        index_key = (element, element_type)
+        keys = self._type_index.get(index_key)
+
+        if keys is None:
+            keys = tuple(where({"type": element_type}))
+            self._type_index[index_key] = keys
+
+        return iter(keys)
+
+    def _clear_type_index(self):
+        """
+        Empties the type index. It will be rebuilt on demand.
+        """
+        self._type_index = {}
+
 # ==============================================================================
 # Edge Attributes
 # ==============================================================================
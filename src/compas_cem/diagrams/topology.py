@@ -334,7 +334,7 @@ class TopologyDiagram(Diagram):
         origin_node : ``int``
             The key of the next origin node.
         """
-        return self.nodes_where({"type": "_origin"})
+        return self._nodes_of_type("_origin")
 
 # ==============================================================================
 #  Connected Edges
@@ -462,7 +462,9 @@ class TopologyDiagram(Diagram):
         attributes : ``dict``
             The attributes of the next trail edge if ``data=True``.
         """
-        return self.edges_where({"type": "trail"}, data)
+        if data:
+            return self.edges_where({"type": "trail"}, data)
+        return self._edges_of_type("trail")
 
     def deviation_edges(self, data=False):
         """
@@ -481,7 +483,9 @@ class TopologyDiagram(Diagram):
         attributes : ``dict``
             The attributes of the next deviation edge if ``data=True``.
         """
-        return self.edges_where({"type": "deviation"}, data)
+        if data:
+            return self.edges_where({"type": "deviation"}, data)
+        return self._edges_of_type("deviation")
 
     def auxiliary_trail_edges(self, data=False):
         """
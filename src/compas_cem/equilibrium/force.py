@@ -68,12 +68,36 @@ def equilibrium_state(topology, tmax=100, eta=1e-6, verbose=False, callback=None
     trail_forces = {}
     node_xyz = {node: topology.node_coordinates(node) for node in topology.nodes()}
 
+    # node data that stays fixed throughout the iterations
+    node_loads = {node: topology.node_load(node) for node in topology.nodes()}
+    node_direct = {node: topology._connected_direct_deviation_edges(node) for node in topology.nodes()}
+    node_indirect = {node: topology._connected_indirect_deviation_edges(node) for node in topology.nodes()}
+
+    # trail edge data to step from a node to the next one in its trail
+    supports = set(topology.support_nodes())
+    trail_steps = {}
+    for trail in trails:
+        for node, next_node in zip(trail[:-1], trail[1:]):
+
+            # correct edge key
+            edge = (node, next_node)
+            if not topology.has_edge(*edge):
+                edge = (next_node, node)
+
+            # query trail edge length and plane, the plane takes precedence over length
+            length = topology.edge_attribute(key=edge, name="length")
+            plane = topology.edge_attribute(key=edge, name="plane")
+
+            trail_steps[node] = (next_node, edge, length, plane)
+
+    sequences = list(topology.sequences())
+
     for t in range(tmax):  # max iterations
 
         # store last positions for residual
         last_xyz = {k: v for k, v in node_xyz.items()}
 
-        for i in topology.sequences():  # sequences
+        for i in sequences:  # sequences
 
             for trail in trails:
 
@@ -93,30 +117,27 @@ def equilibrium_state(topology, tmax=100, eta=1e-6, verbose=False, callback=None
                 else:
                     rvec = residual_vectors[node]
 
+                # indirect deviation edges only kick in after the first iteration
+                indirect_edges = None
+                if t > 0:
+                    indirect_edges = node_indirect[node]
+
                 # calculate nodal equilibrium to get new residual vector
-                indirect = True
-                if t == 0:
-                    indirect = False
-                rvec = node_equilibrium(topology, node, rvec, node_xyz, indirect)
+                rvec = node_equilibrium(topology,
+                                        node,
+                                        rvec,
+                                        node_xyz,
+                                        node_loads[node],
+                                        node_direct[node],
+                                        indirect_edges)
 
                 # if this is the last node, store reaction force and exit loop
-                if topology.is_node_support(node):
+                if node in supports:
                     reaction_forces[node] = rvec[:]
                     continue
 
-                # otherwise, pick next node in the trail
-                next_node = trail[i + 1]
-
-                # correct edge key
-                edge = (node, next_node)
-                if not topology.has_edge(*edge):
-                    edge = (next_node, node)
-
-                # query trail edge length
-                length = topology.edge_attribute(key=edge, name="length")
-
-                # query trail edge plane, it takes precedence over length
-                plane = topology.edge_attribute(key=edge, name="plane")
+                # otherwise, pick next node in the trail and its edge data
+                next_node, edge, length, plane = trail_steps[node]
 
                 # override length if a plane exists
                 if plane is not None:
@@ -213,7 +234,7 @@ def form_update(form, node_xyz, trail_forces, reaction_forces):
         form.edge_attribute(key=(u, v), name="length", value=length)
 
 
-def node_equilibrium(form, node, t_vec, node_xyz, indirect=False, verbose=False):
+def node_equilibrium(form, node, t_vec, node_xyz, q_vec, direct_edges, indirect_edges=None, verbose=False):
     """
     Calculates the equilibrium of trail and deviation forces at a node.
 
@@ -225,9 +246,16 @@ def node_equilibrium(form, node, t_vec, node_xyz, indirect=False, verbose=False)
         A node key.
     t_vec : ``list``
         A trail vector.
-    indirect : ``bool``
-        Flag to consider indirect deviation edges in the calculation.
-        Defaults to ``False``.
+    node_xyz : ``dict``
+        A dictionary with node keys and xyz coordinates as values.
+    q_vec : ``list``
+        The load vector applied to the node.
+    direct_edges : ``list``
+        The keys of the direct deviation edges connected to the node.
+    indirect_edges : ``list``, optional
+        The keys of the indirect deviation edges connected to the node.
+        If ``None``, indirect deviation edges are not considered.
+        Defaults to ``None``.
     verbose : ``bool``
         Flag to print out internal output. Defaults to ``False``.
 
@@ -237,11 +265,10 @@ def node_equilibrium(form, node, t_vec, node_xyz, indirect=False, verbose=False)
         The new trail vector.
     """
     tvec_in = scale_vector(t_vec, -1.0)
-    q_vec = form.node_load(node)
-    rd_vec = direct_deviation_edges_resultant_vector(form, node, node_xyz)
+    rd_vec = deviation_edges_resultant_vector(form, node, node_xyz, direct_edges)
 
-    if indirect:
-        ri_vec = indirect_deviation_edges_resultant_vector(form, node, node_xyz)
+    if indirect_edges is not None:
+        ri_vec = deviation_edges_resultant_vector(form, node, node_xyz, indirect_edges)
     else:
         ri_vec = [0.0, 0.0, 0.0]
 
@@ -252,7 +279,7 @@ def node_equilibrium(form, node, t_vec, node_xyz, indirect=False, verbose=False)
         print("node", node)
         print("qvec", q_vec)
         print("rd_vec", rd_vec)
-        print("ri_vec", rd_vec)
+        print("ri_vec", ri_vec)
         print("t vec np", tvec_out)
 
     return tvec_out
@@ -330,46 +357,6 @@ def deviation_edges_resultant_vector(form, node, node_xyz, deviation_edges):
     return r_vec
 
 
-def direct_deviation_edges_resultant_vector(form, node, node_xyz):
-    """
-    Adds up the force vectors of the direct deviation edges incident to a node.
-
-    Parameters
-    ----------
-    form : ``FormDiagram``
-        A form diagram.
-    node : ``int``
-        A node key.
-
-    Returns
-    -------
-    rvec : ``list``
-        The resulting force vector.
-    """
-    deviation_edges = form._connected_direct_deviation_edges(node)
-    return deviation_edges_resultant_vector(form, node, node_xyz, deviation_edges)
-
-
-def indirect_deviation_edges_resultant_vector(form, node, node_xyz):
-    """
-    Adds up the force vectors of the indirect deviation edges incident to a node.
-
-    Parameters
-    ----------
-    form : ``FormDiagram``
-        A form diagram.
-    node : ``int``
-        A node key.
-
-    Returns
-    -------
-    rvec : ``list``
-        The resulting force vector.
-    """
-    deviation_edges = form._connected_indirect_deviation_edges(node)
-    return deviation_edges_resultant_vector(form, node, node_xyz, deviation_edges)
-
-
 def trail_vector_out(tvec_in, q_vec, rd_vec, ri_vec):
     """
     Calculate an outgoing trail vector.
@@ -45,14 +45,23 @@ def static_equilibrium_numpy(topology, tmax=100, eta=1e-6, verbose=False, callba
     return form
 
 
-def equilibrium_state_numpy(topology, tmax=100, eta=1e-6, verbose=False, callback=None):
+def equilibrium_state_numpy(topology, tmax=100, eta=1e-6, verbose=False, callback=None, topology_state=None):
     """
     Equilibrate forces in a topology diagram using numpy.
+
+    A ``topology_state`` precomputed with ``topology_state_numpy()`` can be
+    passed in to skip gathering the immutable data of the diagram on every call.
     """
-    trails = list(topology.trails())
+    if topology_state is None:
+        topology_state = topology_state_numpy(topology)
 
-    # there must be at least one trail
-    assert len(trails) != 0, "No trails in the diagram!"
+    # input, immutable
+    trails = topology_state["trails"]
+    node_loads = topology_state["node_loads"]
+    node_direct = topology_state["node_direct"]
+    node_indirect = topology_state["node_indirect"]
+    edge_keys = topology_state["edge_keys"]
+    edge_planes = topology_state["edge_planes"]
 
     # input, output
     node_xyz = {n: np.array(topology.node_coordinates(n)) for n in topology.nodes()}
@@ -61,23 +70,6 @@ def equilibrium_state_numpy(topology, tmax=100, eta=1e-6, verbose=False, callbac
     edge_forces = {e: np.array(topology.edge_force(e)) for e in topology.edges()}
     edge_lengths = {e: np.array(topology.edge_attribute(e, "length")) for e in topology.edges()}
 
-    # input, immutable
-    # numpy
-    node_loads = {n: np.array(topology.node_load(n)) for n in topology.nodes()}
-    # no numpy
-    node_direct = {n: topology._connected_direct_deviation_edges(n) for n in topology.nodes()}
-    node_indirect = {n: topology._connected_indirect_deviation_edges(n) for n in topology.nodes()}
-    edge_keys = {e for e in topology.edges()}
-
-    # edge planes
-    edge_planes = {}
-    for edge in topology.trail_edges():
-        plane = topology.edge_attribute(edge, "plane")
-        if not plane:
-            continue
-        plane = [np.array(vector) for vector in plane]
-        edge_planes[edge] = plane
-
     # internals
     residual_vectors = {}
 
@@ -222,6 +214,58 @@ def equilibrium_state_numpy(topology, tmax=100, eta=1e-6, verbose=False, callbac
     return eq_state
 
 
+def topology_state_numpy(topology):
+    """
+    Gather the data of a topology diagram that stays fixed during equilibrium.
+
+    Parameters
+    ----------
+    topology : :class:`compas_cem.diagrams.TopologyDiagram`
+        A topology diagram.
+
+    Returns
+    -------
+    topology_state : ``dict``
+        A dictionary with the trails, the node loads, the direct and indirect
+        deviation edges per node, the edge keys and the trail edge planes.
+
+    Notes
+    -----
+    Node coordinates, edge forces and edge lengths are not part of the state
+    since they can change between calls, e.g. during an optimization.
+    """
+    trails = list(topology.trails())
+
+    # there must be at least one trail
+    assert len(trails) != 0, "No trails in the diagram!"
+
+    # numpy
+    node_loads = {n: np.array(topology.node_load(n)) for n in topology.nodes()}
+    # no numpy
+    node_direct = {n: topology._connected_direct_deviation_edges(n) for n in topology.nodes()}
+    node_indirect = {n: topology._connected_indirect_deviation_edges(n) for n in topology.nodes()}
+    edge_keys = {e for e in topology.edges()}
+
+    # edge planes
+    edge_planes = {}
+    for edge in topology.trail_edges():
+        plane = topology.edge_attribute(edge, "plane")
+        if not plane:
+            continue
+        plane = [np.array(vector) for vector in plane]
+        edge_planes[edge] = plane
+
+    topology_state = {}
+    topology_state["trails"] = trails
+    topology_state["node_loads"] = node_loads
+    topology_state["node_direct"] = node_direct
+    topology_state["node_indirect"] = node_indirect
+    topology_state["edge_keys"] = edge_keys
+    topology_state["edge_planes"] = edge_planes
+
+    return topology_state
+
+
 def form_update(form, node_xyz, trail_forces, reaction_forces):
     """
     Update the node and edge attributes of a form after equilibrating it.
@@ -295,13 +339,14 @@ def deviation_edges_resultant_vector(node, node_xyz, deviation_edges, edge_force
     if not deviation_edges:
         return r_vec
 
-    for edge in deviation_edges:
-        force = edge_forces[edge]
-        vector = incoming_edge_vector(node, node_xyz, edge, normalize=True)
-        r_vec = r_vec + force * vector
+    xyz = node_xyz[node]
 
-    # bottleneck 40%
-    # TODO: check if np.array forces broadcasts well with vectors array
+    for u, v in deviation_edges:
+        other = u if u != node else v
+        vector = node_xyz[other] - xyz
+        # scale by force over length once instead of normalizing the vector first
+        scale = edge_forces[(u, v)] / np.sqrt(np.dot(vector, vector))
+        r_vec = r_vec + scale * vector
 
     return r_vec
 
@@ -389,16 +434,6 @@ def incoming_edge_vectors(node, node_xyz, edges, normalize=False):
     return vectors
 
 
-def incoming_edge_vector(node, node_xyz, edge, normalize=False):
-    """
-    Temporary alternative to Diagram.incoming_edge_vectors()
-    """
-    u, v = edge
-    other = u if u != node else v
-
-    return vector_two_nodes(node_xyz[other], node_xyz[node], normalize)
-
-
 def vector_two_nodes(a, b, normalize=False):
     """
     Calculates the vector between the xyz coordinates of two noddes.
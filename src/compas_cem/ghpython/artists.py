@@ -97,10 +97,14 @@ class DiagramArtist(NetworkArtist):
         edges: list of :class:`Rhino.Geometry.Line`
         """
         edges = edges or list(self.diagram.edges())
+
+        # query the coordinates of every end node only once
+        nodes = {node for edge in edges for node in edge}
+        node_xyz = {node: self.diagram.node_coordinates(node) for node in nodes}
+
         lines = []
-        for edge in edges:
-            start, end = self.diagram.edge_coordinates(*edge)
-            lines.append({'start': start, 'end': end})
+        for u, v in edges:
+            lines.append({'start': node_xyz[u], 'end': node_xyz[v]})
 
         return draw_lines(lines)
 
@@ -1,4 +1,5 @@
 from compas.geometry import closest_point_on_plane
+from compas.geometry import normalize_vector
 
 from compas_cem.optimization.constraints import VectorConstraint
 
@@ -12,6 +13,11 @@ class PlaneConstraint(VectorConstraint):
     """
     def __init__(self, node=None, plane=None, weight=1.0):
         super(PlaneConstraint, self).__init__(node, plane, weight)
+        self._origin = None
+        self._normal = None
+
+        if plane is not None:
+            self._update_plane()
 
     def reference(self, data):
         """
@@ -24,6 +30,98 @@ class PlaneConstraint(VectorConstraint):
         plane = self._target
         return closest_point_on_plane(point, plane)
 
+    def penalty(self, data):
+        """
+        The squared distance between the node and the target plane.
+
+        Returns
+        -------
+        error : ``float``
+            The squared distance.
+
+        Notes
+        -----
+        The distance is calculated directly from the projection of the node
+        onto the unit normal of the plane. No closest point is created in between.
+        """
+        point = data["node_xyz"][self._key]
+        ox, oy, oz = self._origin
+        nx, ny, nz = self._normal
+
+        dot = (point[0] - ox) * nx + (point[1] - oy) * ny + (point[2] - oz) * nz
+
+        return dot * dot * self._weight
+
+    def origin(self):
+        """
+        The origin of the target plane.
+        """
+        return self._origin
+
+    def normal(self):
+        """
+        The unit normal of the target plane.
+        """
+        return self._normal
+
+    @classmethod
+    def penalty_batch(cls, constraints):
+        """
+        Creates a function that adds up the penalties of many plane constraints at once.
+
+        Parameters
+        ----------
+        constraints : ``list`` of :class:`compas_cem.optimization.PlaneConstraint`
+            The plane constraints to evaluate together.
+
+        Returns
+        -------
+        penalty_func : ``function``
+            A function that takes the same data as :meth:`penalty` and
+            returns the sum of the squared distances of all the constraints.
+
+        Notes
+        -----
+        This requires numpy. It is not available in IronPython.
+        """
+        import autograd.numpy as np
+
+        keys = [constraint.key() for constraint in constraints]
+        origins = np.array([constraint.origin() for constraint in constraints]).reshape(-1, 3)
+        normals = np.array([constraint.normal() for constraint in constraints]).reshape(-1, 3)
+        weights = np.array([constraint.weight for constraint in constraints])
+
+        def penalty_func(data):
+            node_xyz = data["node_xyz"]
+            xyz = np.array([node_xyz[key] for key in keys]).reshape(-1, 3)
+            dots = np.sum((xyz - origins) * normals, axis=1)
+            return np.sum(weights * dots * dots)
+
+        return penalty_func
+
+    def _update_plane(self):
+        """
+        Caches the origin and the unit normal of the target plane.
+        """
+        origin, normal = self._target
+        self._origin = list(origin)
+        self._normal = normalize_vector(normal)
+
+    @property
+    def data(self):
+        """
+        A data dictionary that represents a ``PlaneConstraint`` object.
+        """
+        return super(PlaneConstraint, self).data
+
+    @data.setter
+    def data(self, data):
+        """
+        Overwrites this object's attributes with a data dictionary.
+        """
+        super(PlaneConstraint, type(self)).data.fset(self, data)
+        self._update_plane()
+
 
 if __name__ == "__main__":
     pass
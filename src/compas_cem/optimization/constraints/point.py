@@ -17,6 +17,39 @@ class PointConstraint(VectorConstraint):
         """
         return data["node_xyz"][self.key()]
 
+    @classmethod
+    def penalty_batch(cls, constraints):
+        """
+        Creates a function that adds up the penalties of many point constraints at once.
+
+        Parameters
+        ----------
+        constraints : ``list`` of :class:`compas_cem.optimization.PointConstraint`
+            The point constraints to evaluate together.
+
+        Returns
+        -------
+        penalty_func : ``function``
+            A function that takes the same data as :meth:`penalty` and
+            returns the sum of the squared distances of all the constraints.
+
+        Notes
+        -----
+        This requires numpy. It is not available in IronPython.
+        """
+        import autograd.numpy as np
+
+        keys = [constraint.key() for constraint in constraints]
+        targets = np.array([list(constraint.target()) for constraint in constraints]).reshape(-1, 3)
+        weights = np.array([constraint.weight for constraint in constraints])
+
+        def penalty_func(data):
+            node_xyz = data["node_xyz"]
+            xyz = np.array([node_xyz[key] for key in keys]).reshape(-1, 3)
+            return np.sum(weights * np.sum(np.square(xyz - targets), axis=1))
+
+        return penalty_func
+
 
 if __name__ == "__main__":
     pass
@@ -1,13 +1,15 @@
 import numpy as np
 
 from autograd import grad as agrad
+from autograd import value_and_grad as avalue_and_grad
 
 
 __all__ = ["grad_finite_differences_numpy",
-           "grad_autograd"]
+           "grad_autograd",
+           "value_and_grad_autograd"]
 
 # ------------------------------------------------------------------------------
-# Gradient calculation with finite differences
+# Gradient calculation with automatic differentiation
 # ------------------------------------------------------------------------------
 
 
@@ -20,6 +22,17 @@ def grad_autograd(x, grad, grad_func):
 
     return grad
 
+
+def value_and_grad_autograd(x, grad, x_func):
+    """
+    Calculates the value and the gradient of a function in a single pass with
+    automatic differentiation. Updates grad in-place and returns the value.
+    """
+    vg_func = avalue_and_grad(x_func)
+    fx, grad[:] = vg_func(x)
+
+    return fx
+
 # ------------------------------------------------------------------------------
 # Gradient calculation with finite differences
 # ------------------------------------------------------------------------------
@@ -32,13 +45,18 @@ def grad_finite_differences_numpy(x, grad, x_func, step_size):
     # finite difference
     fx0 = x_func(x)
 
-    for i in range(len(x)):  # vectorize with numpy?
+    # perturb one entry at a time of a single working copy
+    _x = np.array(x, dtype=float)
 
-        _x = np.copy(x)
-        _x[i] += step_size
+    for i in range(len(_x)):
+
+        xi = _x[i]
+        _x[i] = xi + step_size
 
         fx1 = x_func(_x)  # bottleneck
 
+        _x[i] = xi
+
         delta_fx = (fx1 - fx0) / step_size
         grad[i] = delta_fx
 
@@ -112,7 +112,7 @@ def nlopt_status(constant):
     return results[constant]
 
 
-def nlopt_solver(f, algorithm, dims, bounds_up, bounds_low, iters, eps, ftol):
+def nlopt_solver(f, algorithm, dims, bounds_up, bounds_low, iters, eps, ftol, xtol=None):
     """
     Wrapper around a typical nlopt solver routine.
     """
@@ -126,6 +126,9 @@ def nlopt_solver(f, algorithm, dims, bounds_up, bounds_low, iters, eps, ftol):
     if ftol is not None:
         solver.set_ftol_abs(ftol)  # abs per recommendation in the NLOpt docs
 
+    if xtol is not None:
+        solver.set_xtol_rel(xtol)
+
     if eps is not None:
         solver.set_stopval(eps)
 
@@ -1,9 +1,18 @@
 __all__ = ["objective_function_numpy"]
 
 
-def objective_function_numpy(x, grad, x_func, grad_func):
+def objective_function_numpy(x, grad, x_func, grad_func=None, vg_func=None):
     """
+    Evaluates an objective function and, if requested, its gradient.
+
+    The gradient is only computed when ``grad`` is not empty.
+    If ``vg_func`` is given, it calculates value and gradient in one pass,
+    updating ``grad`` in-place. Otherwise, ``grad_func`` updates ``grad``
+    in-place after ``x_func`` calculates the value.
     """
+    if grad.size > 0 and vg_func is not None:
+        return vg_func(x, grad)
+
     fx = x_func(x)
 
     if grad.size > 0:
@@ -6,8 +6,10 @@ from compas_cem.data import Data
 
 from compas_cem.equilibrium import static_equilibrium
 from compas_cem.equilibrium.force_numpy import equilibrium_state_numpy
+from compas_cem.equilibrium.force_numpy import topology_state_numpy
 
 from compas_cem.optimization import grad_autograd
+from compas_cem.optimization import value_and_grad_autograd
 from compas_cem.optimization import objective_function_numpy
 from compas_cem.optimization import nlopt_solver
 from compas_cem.optimization import nlopt_status
@@ -17,6 +19,27 @@ from nlopt import RoundoffLimited
 
 __all__ = ["Optimizer"]
 
+
+class _StopValueReached(Exception):
+    """
+    Signals that the penalty dropped below the convergence threshold.
+    """
+    pass
+
+
+class _MaxEvalReached(Exception):
+    """
+    Signals that the objective function was evaluated as many times as allowed.
+    """
+    pass
+
+
+class _FtolReached(Exception):
+    """
+    Signals that the penalty changed less than the tolerance between two iterations.
+    """
+    pass
+
 # ------------------------------------------------------------------------------
 # Optimizer
 # ------------------------------------------------------------------------------
@@ -37,6 +60,9 @@ class Optimizer(Data):
         self.gradient_norm = None
         self.status = None
 
+        self._constraint_batches = None
+        self._parameter_tuples = None
+
 # ------------------------------------------------------------------------------
 # Counters
 # ------------------------------------------------------------------------------
@@ -79,6 +105,7 @@ class Optimizer(Data):
         """
         key = (parameter.key(), parameter.attr_name())
         self.parameters[key] = parameter
+        self._parameter_tuples = None
 
     def add_constraint(self, constraint):
         """
@@ -86,6 +113,7 @@ class Optimizer(Data):
         """
         key = constraint.key()
         self.constraints[key] = constraint
+        self._constraint_batches = None
 
 # ------------------------------------------------------------------------------
 # Removals
@@ -98,6 +126,7 @@ class Optimizer(Data):
         if key not in self.parameters:
             raise KeyError("Parameter not found at object key: {}".format(key))
         del self.parameters[key]
+        self._parameter_tuples = None
 
     def remove_constraint(self, key):
         """
@@ -106,35 +135,56 @@ class Optimizer(Data):
         if key not in self.constraints:
             raise KeyError("Constraints not found on object key: {}".format(key))
         del self.constraints[key]
+        self._constraint_batches = None
 
 # ------------------------------------------------------------------------------
 # Objective Function
 # ------------------------------------------------------------------------------
 
-    def objective_func(self, topology, grad_func, tmax, eta):
+    def objective_func(self, topology, grad_func=None, tmax=100, eta=1e-6, topology_state=None):
         """
         The objective function to minimize.
+
+        If ``grad_func`` is ``None``, the value and the gradient of the objective
+        are calculated in a single pass. Otherwise, ``grad_func`` calculates the gradient.
         """
         obj_func = objective_function_numpy
-        func = partial(self._optimize_form, topology=topology, tmax=tmax, eta=eta)
-        return partial(obj_func, x_func=func, grad_func=grad_func)
+        func = partial(self._optimize_form, topology=topology, tmax=tmax, eta=eta, topology_state=topology_state)
+        if grad_func is not None:
+            return partial(obj_func, x_func=func, grad_func=grad_func)
+        vg_func = self.value_and_gradient_func(topology, tmax, eta, topology_state)
+        return partial(obj_func, x_func=func, vg_func=vg_func)
 
 # ------------------------------------------------------------------------------
 # Gradient Function
 # ------------------------------------------------------------------------------
 
-    def gradient_func(self, topology, tmax, eta):
+    def gradient_func(self, topology, tmax, eta, topology_state=None):
         """
         The objective function to calculate gradients from.
         """
-        x_func = partial(self._optimize_form, topology=topology, tmax=tmax, eta=eta)
+        x_func = partial(self._optimize_form, topology=topology, tmax=tmax, eta=eta, topology_state=topology_state)
         return partial(grad_autograd, grad_func=x_func)
 
+    def value_and_gradient_func(self, topology, tmax, eta, topology_state=None):
+        """
+        The objective function to calculate its value and gradients from in one pass.
+
+        Notes
+        -----
+        Gradients are traced on a copy of the topology diagram.
+        The input topology diagram only receives the plain parameter values.
+        """
+        topology_b = topology.copy()
+        x_func = partial(self._optimize_form, topology=topology_b, tmax=tmax, eta=eta, topology_state=topology_state)
+        vg_func = partial(value_and_grad_autograd, x_func=x_func)
+        return partial(self._value_and_gradient, topology=topology, vg_func=vg_func)
+
 # ------------------------------------------------------------------------------
 # Solver
 # ------------------------------------------------------------------------------
 
-    def solve_nlopt(self, topology, algorithm, iters, eps=None, tmax=100, eta=1e-6):
+    def solve_nlopt(self, topology, algorithm, iters, eps=None, tmax=100, eta=1e-6, ftol=None, xtol=None, verbose=True, x0=None):
         """
         Solve an optimization problem with NLOpt.
 
@@ -153,6 +203,10 @@ class Optimizer(Data):
             - TNEWTON: Preconditioned Truncated Newton
 
             Refer to the NLopt `documentation <https://nlopt.readthedocs.io/en/latest/>`_ for more details on their theoretical underpinnings.
+
+            Additionally, LBFGSB runs the bounded L-BFGS-B implementation of SciPy, if installed.
+            It ignores ``xtol`` and stops once the norm of the projected gradient drops below ``1e-10``.
+            SciPy's default relative tolerance on the change of the penalty applies as well.
         iters : ``int``
             The maximum number of iterations to run the optimization algorithm for.
         eps : ``float``, optional
@@ -168,6 +222,24 @@ class Optimizer(Data):
             The numerical converge threshold of the CEM form-finding algorithm.
             If ``tmax`` is hit first, the form-finding algorithm will stop early.
             Defaults to ``1e-6``.
+        ftol : ``float``, optional
+            The absolute change of the objective function value between two
+            iterations below which the optimization algorithm stops.
+            If value is set to ``None``, this stopping criterion is ignored.
+            Defaults to ``None``.
+        xtol : ``float``, optional
+            The relative change of the optimization parameters between two
+            iterations below which the optimization algorithm stops.
+            If value is set to ``None``, this stopping criterion is ignored.
+            Defaults to ``None``.
+        verbose : ``bool``, optional
+            Flag to print out the outcome of the optimization.
+            Defaults to ``True``.
+        x0 : ``list`` of ``float``, optional
+            The initial values of the optimization parameters.
+            If value is set to ``None``, the current parameter values in the
+            topology diagram are used instead.
+            Defaults to ``None``.
 
         Returns
         -------
@@ -177,13 +249,25 @@ class Optimizer(Data):
         # test for bad stuff before going any further
         self.check_optimization_sanity()
 
+        # group constraints to evaluate them in batches
+        self._build_constraint_batches()
+
+        # freeze the order and the targets of the parameters
+        self._build_parameter_tuples()
+
+        # gather the data that stays fixed throughout the optimization
+        topology_state = topology_state_numpy(topology)
+
         # compose gradient and objective functions
         topology_b = topology.copy()
-        grad_func = self.gradient_func(topology_b, tmax, eta)
-        penalty_func = self.objective_func(topology, grad_func, tmax, eta)
+        grad_func = self.gradient_func(topology_b, tmax, eta, topology_state)
+        penalty_func = self.objective_func(topology, tmax=tmax, eta=eta, topology_state=topology_state)
 
         # generate optimization variables
-        x = self.optimization_parameters(topology)
+        if x0 is None:
+            x = self.optimization_parameters(topology)
+        else:
+            x = np.array(x0, dtype=float)
 
         # extract the lower and upper bounds to optimization variables
         bounds_low, bounds_up = self.optimization_bounds(topology)
@@ -196,27 +280,45 @@ class Optimizer(Data):
                             "bounds_up": bounds_up,
                             "iters": iters,
                             "eps": eps,
-                            "ftol": None}
-
-        # assemble optimization solver
-        solver = nlopt_solver(**hyper_parameters)
-
-        # solve optimization problem
-        x_opt = None
-        try:
-            x_opt = solver.optimize(x)
+                            "ftol": ftol,
+                            "xtol": xtol}
+
+        # solve optimization problem with scipy's bounded L-BFGS instead of nlopt
+        if algorithm == "LBFGSB":
+            del hyper_parameters["algorithm"]
+            del hyper_parameters["dims"]
+            del hyper_parameters["xtol"]
+            x_opt, loss_opt, evals, status = self._solve_scipy_lbfgsb(x=x, **hyper_parameters)
+
+            # leave the topology at the optimum, not at the last evaluated point
+            self._update_topology_origin_nodes(x_opt, topology)
+            self._update_topology_edges(x_opt, topology)
+
+            if verbose:
+                print("Number of evaluations incurred: {}".format(evals))
+
+        else:
+            # assemble optimization solver
+            solver = nlopt_solver(**hyper_parameters)
+
+            # solve optimization problem
+            x_opt = None
+            try:
+                x_opt = solver.optimize(x)
+                evals = solver.get_numevals()
+                if verbose:
+                    print("Optimization ended correctly!")
+                    print("Number of evaluations incurred: {}".format(evals))
+            except RoundoffLimited:
+                if verbose:
+                    print("Optimization was halted because roundoff errors limited progress")
+                    print("Returned results are generally still useful though!")
+                x_opt = self.optimization_parameters(topology)
+
+            # fetch last optimum value of loss function
+            loss_opt = solver.last_optimum_value()
             evals = solver.get_numevals()
-            print("Optimization ended correctly!")
-            print("Number of evaluations incurred: {}".format(evals))
-        except RoundoffLimited:
-            print("Optimization was halted because roundoff errors limited progress")
-            print("Returned results are generally still useful though!")
-            x_opt = self.optimization_parameters(topology)
-
-        # fetch last optimum value of loss function
-        loss_opt = solver.last_optimum_value()
-        evals = solver.get_numevals()
-        status = nlopt_status(solver.last_optimize_result())
+            status = nlopt_status(solver.last_optimize_result())
 
         # set optimizer attributes
         self.x_opt = x_opt
@@ -229,11 +331,153 @@ class Optimizer(Data):
         self.gradient = grad_func(x_opt, np.zeros(x_opt.size))
         self.gradient_norm = np.linalg.norm(self.gradient)
 
-        print("Optimization status: {}".format(status))
+        if verbose:
+            print("Optimization status: {}".format(status))
 
         # exit like a champion
         return static_equilibrium(topology)
 
+    def solve_nlopt_multistart(self, topology, algorithm, iters, starts=8, seed=None, verbose=False, **kwargs):
+        """
+        Solve an optimization problem with NLOpt from multiple starting points.
+
+        The first start uses the current parameter values in the topology diagram.
+        The remaining ones are sampled uniformly at random within the parameter bounds.
+        The start that reaches the lowest penalty is kept.
+
+        Parameters
+        ----------
+        topology : :class:`compas_cem.diagrams.TopologyDiagram`
+            A topology diagram.
+        algorithm : ``str``
+            The name of the gradient-based local optimization algorithm to use.
+            See :meth:`solve_nlopt` for the supported algorithms.
+        iters : ``int``
+            The maximum number of iterations to run the optimization algorithm for, per start.
+        starts : ``int``, optional
+            The number of starting points to optimize from.
+            Defaults to ``8``.
+        seed : ``int``, optional
+            The seed of the random number generator that samples the starting points.
+            Defaults to ``None``.
+        verbose : ``bool``, optional
+            Flag to print out the penalty reached by every start.
+            Defaults to ``False``.
+        kwargs : ``dict``, optional
+            Extra named arguments for :meth:`solve_nlopt`, except ``x0``.
+
+        Returns
+        -------
+        form : :class:`compas_cem.diagrams.FormDiagram`
+            The form diagram of the best start.
+        """
+        if starts < 1:
+            msg = "At least one start is required. Got {} starts.".format(starts)
+            raise ValueError(msg)
+
+        if "x0" in kwargs:
+            msg = "Starting points are sampled by the multistart. x0 is not supported."
+            raise ValueError(msg)
+
+        # bounds are relative to the input parameter values, so sample them once
+        x_start = self.optimization_parameters(topology)
+        bounds_low, bounds_up = self.optimization_bounds(topology)
+        random_state = np.random.RandomState(seed)
+
+        best = None
+        for i in range(starts):
+
+            x0 = x_start
+            if i > 0:
+                x0 = random_state.uniform(bounds_low, bounds_up)
+
+            # every start works on its own copy of the input topology
+            self.solve_nlopt(topology.copy(), algorithm, iters, verbose=False, x0=x0, **kwargs)
+
+            if verbose:
+                print("Start {}: penalty {}".format(i, self.penalty))
+
+            if best is None or self.penalty < best["penalty"]:
+                best = {name: getattr(self, name) for name in ("x_opt", "penalty", "evals", "status", "gradient", "gradient_norm")}
+
+        # set optimizer attributes to those of the best start
+        for name, value in best.items():
+            setattr(self, name, value)
+
+        # write the best parameters into the input topology
+        self._update_topology_origin_nodes(self.x_opt, topology)
+        self._update_topology_edges(self.x_opt, topology)
+
+        return static_equilibrium(topology)
+
+    def _solve_scipy_lbfgsb(self, f, x, bounds_low, bounds_up, iters, eps=None, ftol=None):
+        """
+        Minimizes an nlopt-style objective function with SciPy's L-BFGS-B.
+
+        Notes
+        -----
+        Like in nlopt, ``iters`` caps the number of objective function evaluations,
+        ``eps`` is a stop value and ``ftol`` is an absolute tolerance on the change
+        of the penalty between two iterations. The gradient tolerance is ``1e-10``.
+
+        Returns
+        -------
+        result : ``tuple``
+            The optimal parameters, the penalty, the number of evaluations and the status.
+        """
+        from scipy.optimize import minimize
+
+        best = {"x": np.copy(x), "f": np.inf, "evals": 0, "f_last": None, "f_iter": None}
+
+        def value_and_gradient(x):
+            grad = np.zeros(x.size)
+            fx = f(x, grad)
+            best["evals"] += 1
+            best["f_last"] = fx
+            if fx < best["f"]:
+                best["x"] = np.copy(x)
+                best["f"] = fx
+            # emulate nlopt's stopval
+            if eps is not None and fx < eps:
+                raise _StopValueReached
+            # emulate nlopt's maxeval, scipy may overshoot maxfun in a line search
+            if best["evals"] >= iters:
+                raise _MaxEvalReached
+            return fx, grad
+
+        statuses = {0: "SCIPY_SUCCESS",
+                    1: "SCIPY_MAXEVAL_REACHED",
+                    2: "SCIPY_FAILURE"}
+
+        def callback(xk):
+            # emulate nlopt's absolute ftol, scipy's own ftol is relative
+            # the last evaluation of an iteration is at the accepted point
+            f_iter = best["f_last"]
+            if ftol is not None and best["f_iter"] is not None:
+                if abs(best["f_iter"] - f_iter) <= ftol:
+                    raise _FtolReached
+            best["f_iter"] = f_iter
+
+        options = {"maxiter": iters, "maxfun": iters, "gtol": 1e-10}
+
+        try:
+            result = minimize(value_and_gradient,
+                              x0=x,
+                              jac=True,
+                              method="L-BFGS-B",
+                              bounds=list(zip(bounds_low, bounds_up)),
+                              callback=callback,
+                              options=options)
+            status = statuses.get(result.status, "SCIPY_FAILURE")
+        except _StopValueReached:
+            status = "SCIPY_STOPVAL_REACHED"
+        except _MaxEvalReached:
+            status = "SCIPY_MAXEVAL_REACHED"
+        except _FtolReached:
+            status = "SCIPY_FTOL_REACHED"
+
+        return best["x"], best["f"], best["evals"], status
+
 # ------------------------------------------------------------------------------
 # Optimization parameters
 # ------------------------------------------------------------------------------
@@ -272,18 +516,39 @@ class Optimizer(Data):
 # Updates
 # ------------------------------------------------------------------------------
 
-    def _update_topology_origin_nodes(self, x, topology):
+    def _build_parameter_tuples(self):
         """
+        Splits the parameters into tuples of node and edge parameters.
+
+        Notes
+        -----
+        Node parameters are stored as ``(index, node, xyz index)``.
+        Edge parameters are stored as ``(index, edge)``.
         """
         map_xyz_index = {"x": 0, "y": 1, "z": 2}
 
-        for index, ckey in self.index_parameter().items():
+        node_parameters = []
+        edge_parameters = []
+
+        for index, parameter in enumerate(self.parameters.values()):
 
-            node = self.parameters[ckey].key()
+            key = parameter.key()
 
             # TODO: weak check, needs to be handled differently
-            if not isinstance(node, int):
-                continue
+            if isinstance(key, int):
+                node_parameters.append((index, key, map_xyz_index[parameter.attr_name()]))
+            else:
+                edge_parameters.append((index, key))
+
+        self._parameter_tuples = (tuple(node_parameters), tuple(edge_parameters))
+
+    def _update_topology_origin_nodes(self, x, topology):
+        """
+        """
+        if self._parameter_tuples is None:
+            self._build_parameter_tuples()
+
+        for index, node, j in self._parameter_tuples[0]:
 
             # TODO: this check should happen upon assembly, not during calculation?
             if not topology.is_node_origin(node):
@@ -292,8 +557,6 @@ class Optimizer(Data):
 
             # TODO: refactor to handle xyz more transparently
             xyz = topology.node_xyz(key=node)
-            parameter = self.parameters[ckey]
-            j = map_xyz_index[parameter.attr_name()]
             xyz[j] = x[index]
 
             # self.form.node_xyz(key=node, xyz=xyz)  # form.node_xyz(node, y=x[])?
@@ -302,13 +565,10 @@ class Optimizer(Data):
     def _update_topology_edges(self, x, topology):
         """
         """
-        for index, ckey in self.index_parameter().items():
-
-            edge = self.parameters[ckey].key()
+        if self._parameter_tuples is None:
+            self._build_parameter_tuples()
 
-            # TODO: weak check, needs to be handled differently
-            if isinstance(edge, int):
-                continue
+        for index, edge in self._parameter_tuples[1]:
 
             if topology.is_trail_edge(edge):
                 name = "length"
@@ -323,22 +583,65 @@ class Optimizer(Data):
 # Optimization
 # ------------------------------------------------------------------------------
 
+    def _build_constraint_batches(self):
+        """
+        Groups the constraints that can calculate their penalties in batches.
+
+        Notes
+        -----
+        Constraints are grouped by their exact class. A group is evaluated with
+        the ``penalty_batch()`` method of its class only if that class defines it
+        itself. Otherwise, every constraint in the group computes its own penalty.
+        """
+        groups = {}
+        for constraint in self.constraints.values():
+            groups.setdefault(type(constraint), []).append(constraint)
+
+        batches = []
+        others = []
+
+        for cls, constraints in groups.items():
+            if "penalty_batch" in cls.__dict__:
+                batches.append(cls.penalty_batch(constraints))
+            else:
+                others.extend(constraints)
+
+        self._constraint_batches = (batches, others)
+
     def _calculate_penalty(self, eq_state):
         """
         """
+        if self._constraint_batches is None:
+            self._build_constraint_batches()
+        batches, others = self._constraint_batches
+
         penalty = 0.0
-        for constraint in self.constraints.values():
-            penalty += constraint.penalty(eq_state)
+
+        for penalty_func in batches:
+            penalty = penalty + penalty_func(eq_state)
+
+        # the remaining constraints go one by one in this process, since their
+        # values are traced by autograd and cannot be shipped to worker processes
+        for constraint in others:
+            penalty = penalty + constraint.penalty(eq_state)
 
         return penalty
 
-    def _optimize_form(self, parameters, topology, tmax, eta):
+    def _value_and_gradient(self, parameters, grad, topology, vg_func):
+        """
+        """
+        self._update_topology_origin_nodes(parameters, topology)
+        self._update_topology_edges(parameters, topology)
+
+        return vg_func(parameters, grad)
+
+    def _optimize_form(self, parameters, topology, tmax, eta, topology_state=None):
         """
         """
         self._update_topology_origin_nodes(parameters, topology)
         self._update_topology_edges(parameters, topology)
 
-        eq_state = equilibrium_state_numpy(topology, tmax, eta)
+        eq_state = equilibrium_state_numpy(topology, tmax, eta, topology_state=topology_state)
 
         return self._calculate_penalty(eq_state)
 
@@ -8,7 +8,7 @@ __all__ = ["solve_nlopt_proxy"]
 # Optimization
 # ------------------------------------------------------------------------------
 
-def solve_nlopt_proxy(topology, constraints, parameters, algorithm, iters, eps=None, tmax=100, eta=1e-6):
+def solve_nlopt_proxy(topology, constraints, parameters, algorithm, iters, eps=None, tmax=100, eta=1e-6, ftol=None, xtol=None):
     """
     Solve a constrained form-finding task through a Proxy server hyperspace tunnel.
 
@@ -46,6 +46,16 @@ def solve_nlopt_proxy(topology, constraints, parameters, algorithm, iters, eps=N
         The numerical converge threshold of the CEM form-finding algorithm.
         If ``tmax`` is hit first, the form-finding algorithm will stop early.
         Defaults to ``1e-6``.
+    ftol : ``float``, optional
+        The absolute change of the objective function value between two
+        iterations below which the optimization algorithm stops.
+        If value is set to ``None``, this stopping criterion is ignored.
+        Defaults to ``None``.
+    xtol : ``float``, optional
+        The relative change of the optimization parameters between two
+        iterations below which the optimization algorithm stops.
+        If value is set to ``None``, this stopping criterion is ignored.
+        Defaults to ``None``.
 
     Returns
     -------
@@ -76,7 +86,7 @@ def solve_nlopt_proxy(topology, constraints, parameters, algorithm, iters, eps=N
         optimizer.add_parameter(parameter)
 
     start = time()
-    form = optimizer.solve_nlopt(topology, algorithm, iters, eps, tmax, eta)
+    form = optimizer.solve_nlopt(topology, algorithm, iters, eps, tmax, eta, ftol, xtol)
 
     duration = round(time() - start, 2)
     objective = optimizer.penalty
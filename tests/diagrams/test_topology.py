@@ -33,6 +33,30 @@ def test_num_keys_deviation_edges(topology, edges):
     assert edges == test_edges
 
 
+@pytest.mark.parametrize("topology",
+                         [pytest.lazy_fixture("threebar_funicular"),
+                          pytest.lazy_fixture("braced_tower_2d")])
+def test_edge_types_after_modification(topology):
+    """
+    Checks that the edges of each type are up-to-date after changing an edge type.
+    """
+    trail_edges = set(topology.trail_edges())
+    deviation_edges = set(topology.deviation_edges())
+
+    edge = deviation_edges.pop()
+    topology.edge_attribute(edge, "type", "trail")
+    trail_edges.add(edge)
+
+    assert set(topology.trail_edges()) == trail_edges
+    assert set(topology.deviation_edges()) == deviation_edges
+    assert set(topology.copy().trail_edges()) == trail_edges
+
+    topology.clear()
+    assert len(list(topology.trail_edges())) == 0
+    assert len(list(topology.deviation_edges())) == 0
+    assert len(list(topology.support_nodes())) == 0
+
+
 # ==============================================================================
 # Tests - Node Queries
 # ==============================================================================
@@ -60,6 +84,20 @@ def test_num_support_nodes(topology, num_supports):
     assert len(list(topology.support_nodes())) == num_supports
 
 
+@pytest.mark.parametrize("topology, loaded_nodes",
+                         [(pytest.lazy_fixture("compression_strut"), [1]),
+                          (pytest.lazy_fixture("threebar_funicular"), [1, 2]),
+                          (pytest.lazy_fixture("tension_chain"), [0])])
+def test_loaded_nodes(topology, loaded_nodes):
+    """
+    Verifies that only the nodes with a large-enough load are returned.
+    """
+    assert set(topology.loaded_nodes()) == set(loaded_nodes)
+    assert topology.number_of_loaded_nodes() == len(loaded_nodes)
+    assert len(list(topology.loaded_nodes(min_force=10.0))) == 0
+    assert all(topology.is_node_loaded(node) == (node in loaded_nodes) for node in topology.nodes())
+
+
 # ==============================================================================
 # Tests - Connected Edges
 # ==============================================================================
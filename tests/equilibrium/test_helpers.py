@@ -5,8 +5,6 @@ import numpy as np
 from compas.geometry import Plane
 
 from compas_cem.equilibrium.force import trail_vector_out
-from compas_cem.equilibrium.force import indirect_deviation_edges_resultant_vector
-from compas_cem.equilibrium.force import direct_deviation_edges_resultant_vector
 from compas_cem.equilibrium.force import deviation_edges_resultant_vector
 from compas_cem.equilibrium.force import trail_edge_length_from_plane
 from compas_cem.equilibrium.force import node_equilibrium
@@ -91,7 +89,8 @@ def test_direct_deviation_edges_resultant_vector(topology, node, resultant):
     """
     topology.build_trails()
     node_xyz = {node: topology.node_coordinates(node) for node in topology.nodes()}
-    a = direct_deviation_edges_resultant_vector(topology, node, node_xyz)
+    edges = topology._connected_direct_deviation_edges(node)
+    a = deviation_edges_resultant_vector(topology, node, node_xyz, edges)
     b = resultant
 
     assert np.allclose(a, b)
@@ -108,7 +107,8 @@ def test_indirect_deviation_edges_resultant_vector(topology, node, resultant):
     """
     topology.build_trails()
     node_xyz = {node: topology.node_coordinates(node) for node in topology.nodes()}
-    a = indirect_deviation_edges_resultant_vector(topology, node, node_xyz)
+    edges = topology._connected_indirect_deviation_edges(node)
+    a = deviation_edges_resultant_vector(topology, node, node_xyz, edges)
     b = resultant
 
     assert np.allclose(a, b)
@@ -126,7 +126,9 @@ def test_node_equilibrium_no_indirect_root_nodes(topology, node, result):
     topology.build_trails()
     node_xyz = {node: topology.node_coordinates(node) for node in topology.nodes()}
     t_vec_in = [0.0, 0.0, 0.0]
-    t_vec_out = node_equilibrium(topology, node, t_vec_in, node_xyz, indirect=False)
+    q_vec = topology.node_load(node)
+    direct_edges = topology._connected_direct_deviation_edges(node)
+    t_vec_out = node_equilibrium(topology, node, t_vec_in, node_xyz, q_vec, direct_edges)
 
     assert np.allclose(t_vec_out, result)
 
@@ -144,6 +146,9 @@ def test_node_equilibrium_with_indirect_root_nodes(topology, node, result):
     topology.build_trails()
     node_xyz = {node: topology.node_coordinates(node) for node in topology.nodes()}
     t_vec_in = [0.0, 0.0, 0.0]
-    t_vec_out = node_equilibrium(topology, node, t_vec_in, node_xyz, indirect=True)
+    q_vec = topology.node_load(node)
+    direct_edges = topology._connected_direct_deviation_edges(node)
+    indirect_edges = topology._connected_indirect_deviation_edges(node)
+    t_vec_out = node_equilibrium(topology, node, t_vec_in, node_xyz, q_vec, direct_edges, indirect_edges)
 
     assert np.allclose(t_vec_out, result)
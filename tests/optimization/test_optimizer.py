@@ -0,0 +1,162 @@
+import pytest
+
+import numpy as np
+
+from compas.geometry import Plane
+
+from compas_cem.equilibrium.force_numpy import equilibrium_state_numpy
+
+from compas_cem.optimization import Optimizer
+from compas_cem.optimization import PlaneConstraint
+from compas_cem.optimization import PointConstraint
+from compas_cem.optimization import ReactionForceConstraint
+from compas_cem.optimization import TrailEdgeForceConstraint
+from compas_cem.optimization import DeviationEdgeLengthConstraint
+from compas_cem.optimization import TrailEdgeParameter
+from compas_cem.optimization import DeviationEdgeParameter
+
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+class OffsetPlaneConstraint(PlaneConstraint):
+    """
+    A plane constraint subclass with its own penalty.
+    """
+    def penalty(self, data):
+        return super(OffsetPlaneConstraint, self).penalty(data) + 1.0
+
+
+@pytest.fixture
+def threebar_optimizer():
+    """
+    An optimizer that pulls the supports of a three-bar funicular to target points.
+    """
+    optimizer = Optimizer()
+    optimizer.add_constraint(PointConstraint(0, [-0.5, 1.0, 0.0]))
+    optimizer.add_constraint(PointConstraint(3, [4.0, 1.5, 0.0]))
+    optimizer.add_parameter(TrailEdgeParameter((0, 1), bound_low=2.0, bound_up=2.0))
+    optimizer.add_parameter(TrailEdgeParameter((2, 3), bound_low=2.0, bound_up=2.0))
+    optimizer.add_parameter(DeviationEdgeParameter((1, 2), bound_low=2.0, bound_up=2.0))
+
+    return optimizer
+
+# ==============================================================================
+# Tests - Penalty
+# ==============================================================================
+
+
+def test_calculate_penalty_matches_constraints(braced_tower_2d):
+    """
+    Checks that the batched penalty equals the sum of the individual penalties.
+    """
+    topology = braced_tower_2d
+    topology.build_trails()
+    eq_state = equilibrium_state_numpy(topology)
+
+    constraints = [PlaneConstraint(1, Plane([0.5, 0.0, 0.0], [1.0, 1.0, 0.0]), weight=2.0),
+                   PlaneConstraint(2, Plane([0.0, 3.0, 1.0], [0.0, 1.0, 0.5])),
+                   PointConstraint(4, [2.0, 1.0, 0.0]),
+                   PointConstraint(5, [1.0, 3.0, 1.0], weight=0.5),
+                   OffsetPlaneConstraint(3, Plane([0.0, 0.0, 0.0], [1.0, 0.0, 0.0])),
+                   ReactionForceConstraint(0, [0.0, 1.0, 0.0]),
+                   TrailEdgeForceConstraint((0, 1), -2.0),
+                   DeviationEdgeLengthConstraint((1, 4), 2.0)]
+
+    optimizer = Optimizer()
+    for constraint in constraints:
+        optimizer.add_constraint(constraint)
+
+    penalty = sum(constraint.penalty(eq_state) for constraint in constraints)
+
+    assert np.allclose(optimizer._calculate_penalty(eq_state), penalty)
+
+# ==============================================================================
+# Tests - Objective
+# ==============================================================================
+
+
+def test_objective_func_with_grad_func(threebar_funicular, threebar_optimizer):
+    """
+    Checks that passing a gradient function matches the single-pass objective.
+    """
+    topology = threebar_funicular
+    topology.build_trails()
+    optimizer = threebar_optimizer
+
+    grad_func = optimizer.gradient_func(topology.copy(), 100, 1e-6)
+    func_a = optimizer.objective_func(topology, grad_func, 100, 1e-6)
+    func_b = optimizer.objective_func(topology, tmax=100, eta=1e-6)
+
+    x = optimizer.optimization_parameters(topology) + 0.1
+    grad_a = np.zeros(x.size)
+    grad_b = np.zeros(x.size)
+
+    assert np.allclose(func_a(x, grad_a), func_b(x, grad_b))
+    assert np.allclose(grad_a, grad_b)
+
+# ==============================================================================
+# Tests - SciPy
+# ==============================================================================
+
+
+@pytest.mark.parametrize("iters, ftol, penalty, status",
+                         [(3, None, None, "SCIPY_MAXEVAL_REACHED"),
+                          (100, None, 5.625, "SCIPY_SUCCESS"),
+                          (100, 1.0, None, "SCIPY_FTOL_REACHED")])
+def test_solve_nlopt_lbfgsb(threebar_funicular, threebar_optimizer, iters, ftol, penalty, status):
+    """
+    Checks that SciPy's L-BFGS-B reaches the optimum within the evaluations budget.
+    """
+    pytest.importorskip("scipy")
+
+    topology = threebar_funicular
+    topology.build_trails()
+    optimizer = threebar_optimizer
+
+    optimizer.solve_nlopt(topology, "LBFGSB", iters, ftol=ftol, verbose=False)
+
+    assert optimizer.evals <= iters
+    assert optimizer.status == status
+    if penalty is not None:
+        assert np.allclose(optimizer.penalty, penalty)
+
+# ==============================================================================
+# Tests - Multistart
+# ==============================================================================
+
+
+def test_solve_nlopt_multistart(threebar_funicular, threebar_optimizer):
+    """
+    Checks that a random start beats the single start within the parameter
+    bounds and that the input topology holds the best parameters afterwards.
+    """
+    topology = threebar_funicular
+    topology.build_trails()
+    optimizer = threebar_optimizer
+
+    optimizer.solve_nlopt(topology.copy(), "SLSQP", 20, verbose=False)
+    penalty = optimizer.penalty
+
+    bounds_low, bounds_up = optimizer.optimization_bounds(topology)
+    form = optimizer.solve_nlopt_multistart(topology, "SLSQP", 20, starts=4, seed=0)
+
+    # the first start repeats the single start, so only a random start can do better
+    assert optimizer.penalty < penalty
+    assert np.all(optimizer.x_opt >= bounds_low) and np.all(optimizer.x_opt <= bounds_up)
+    assert np.allclose(optimizer.optimization_parameters(topology), optimizer.x_opt)
+
+    eq_state = {"node_xyz": {node: form.node_xyz(node) for node in form.nodes()}}
+    assert np.allclose(optimizer._calculate_penalty(eq_state), optimizer.penalty)
+
+
+@pytest.mark.parametrize("starts, kwargs", [(0, {}), (2, {"x0": [0.0, 0.0, 0.0]})])
+def test_solve_nlopt_multistart_invalid(threebar_funicular, threebar_optimizer, starts, kwargs):
+    """
+    Checks that invalid arguments raise a ValueError.
+    """
+    threebar_funicular.build_trails()
+
+    with pytest.raises(ValueError):
+        threebar_optimizer.solve_nlopt_multistart(threebar_funicular, "SLSQP", 20, starts=starts, **kwargs)